@@ -1,7 +1,7 @@
 """
-Simplified Habit Tracker (interactive only, no external dependencies)
+Simplified Habit Tracker (interactive only, no required external dependencies)
 ---------------------------------------------------------------
-Python version: 3.7+
+Python version: 3.10+
 
 Usage:
   python habit_tracker.py
@@ -19,9 +19,11 @@ Commands inside the interactive menu:
   add         → create a new habit (daily or weekly)
   delete      → delete a habit
   complete    → mark a habit as completed on a date
-  analytics   → show longest streaks for all habits  
+  analytics   → show longest streaks for all habits
+  batch       → apply a file of commands (one command/argument per line), saving once
   init        → initialize example habits.json with 5 predefined habits
-  exit        → quit the program
+  save        → flush pending changes to disk immediately
+  exit        → quit the program (pending changes are saved on exit)
 
 Predefined example data: 5 habits (Meditate, Run, Read, Grocery, Call Mom)
 Each has 4 weeks of completions for testing and demonstration.
@@ -30,76 +32,205 @@ Each has 4 weeks of completions for testing and demonstration.
 
 """
 # Libraries to import
+import bisect
 import json
 import os
-from dataclasses import dataclass, asdict
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Dict, Optional, Set, Tuple
+
+try:
+    import orjson # Optional C-accelerated JSON encoder/decoder; stdlib json is the fallback.
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np # Optional; vectorizes the streak scan for long completion histories.
+except ImportError:
+    np = None
+
+try:
+    from numba import njit # Optional; JIT-compiles the integer streak loop.
+except ImportError:
+    njit = None
 
 # Filename used for storing all habits persistently as JSON.
 HABITS_FILENAME = "habits.json"
 DATE_FMT = "%Y-%m-%d" # Standardized date format (ISO-like) used across the application for consistency.
+PRETTY_JSON = os.environ.get("HABITS_PRETTY", "") not in ("", "0") # Compact JSON by default; set HABITS_PRETTY=1 for a human-readable file.
+LOG_COMPACT_THRESHOLD = 1000 # Replaying more log lines than this at load triggers an immediate compaction.
 
-@dataclass
+@dataclass(slots=True) # Slots halve per-instance memory and make attribute access a fixed-offset read.
 class Habit:
     name: str # The descriptive name of the habit (e.g., "Run", "Meditate").
     periodicity: str  # 'daily' or 'weekly'
-    completions: List[str]
+    completions: Set[str] # Set for O(1) duplicate detection; serialized as a sorted list.
+    # Cached parsed completion dates, kept in sync with 'completions' and always in
+    # chronological order so analytics never re-parses or re-sorts. Not persisted to JSON.
+    _parsed: List[date] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Bumped on every completion change; keys the streak memo so unchanged habits
+    # never recompute. Not persisted to JSON.
+    _version: int = field(default=0, init=False, repr=False, compare=False)
 
 # Persistence layer (JSON storage)
-def load_habits(filename: str = HABITS_FILENAME) -> List[Habit]: 
+def load_habits(filename: str = HABITS_FILENAME) -> Dict[str, Habit]: # Habits are keyed by name for O(1) lookup.
+    # Freshly loaded habits restart at _version 0, so entries memoized for a
+    # previous store would collide with their keys; drop them wholesale.
+    _streak_cache.clear()
     if not os.path.exists(filename):
-        return []
-    with open(filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return [Habit(**x) for x in data]
+        data = [] # No snapshot yet; the mutation log below may still hold a fresh store's ops.
+    elif orjson is not None:
+        with open(filename, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    # sys.intern collapses the two possible periodicity values to shared objects,
+    # making the 'daily' comparison in analytics a pointer check.
+    habits = {x["name"]: Habit(x["name"], sys.intern(x["periodicity"]), set(x["completions"])) for x in data}
+    for h in habits.values():
+        # Parse each date string once at load time; ISO strings sort lexicographically
+        # in chronological order, so sorting before parsing keeps _parsed ordered.
+        h._parsed = [_iso_to_date(s) for s in sorted(h.completions)]
+    replayed = _replay_log(habits, filename)
+    if replayed > LOG_COMPACT_THRESHOLD: # Fold a long log back into the snapshot so the next load is cheap.
+        save_habits(habits, filename)
+    return habits
+
+def save_habits(habits: Dict[str, Habit], filename: str = HABITS_FILENAME) -> None: #Serialize and save all habits to a JSON file;
+    records = [_habit_to_dict(h) for h in habits.values()]
+    tmp = filename + ".tmp" # Write to a temp file and rename so readers never see a truncated file.
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 if PRETTY_JSON else 0))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2 if PRETTY_JSON else None)
+    os.replace(tmp, filename) # Atomic on POSIX within one filesystem.
+    log = _log_path(filename)
+    if os.path.exists(log):
+        os.remove(log) # The snapshot now covers everything the log recorded.
 
-def save_habits(habits: List[Habit], filename: str = HABITS_FILENAME) -> None: #Serialize and save all habits to a JSON file; 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump([asdict(h) for h in habits], f, indent=2)
+def _habit_to_dict(h: Habit) -> Dict: # Serializable form of a habit; add new fields here explicitly if the dataclass grows.
+    return {
+        "name": h.name,
+        "periodicity": h.periodicity,
+        "completions": sorted(h.completions), # Sets aren't JSON-serializable; sorted keeps the file stable and diffable.
+    }
+
+# Mutation log (JSON Lines). Each CLI mutation appends one small record in O(1)
+# instead of rewriting the whole snapshot; load_habits replays it, and save_habits
+# compacts it away. A crash between saves therefore loses nothing.
+def _log_path(filename: str) -> str:
+    return filename + ".log.jsonl"
+
+def _append_op(op: Dict, filename: str = HABITS_FILENAME) -> None: # Appends one mutation record to the log.
+    if orjson is not None:
+        line = orjson.dumps(op) + b"\n"
+    else:
+        line = (json.dumps(op) + "\n").encode("utf-8")
+    with open(_log_path(filename), "ab") as f:
+        f.write(line)
+
+def _replay_log(habits: Dict[str, Habit], filename: str) -> int: # Re-applies logged mutations to the snapshot; returns the line count.
+    log = _log_path(filename)
+    if not os.path.exists(log):
+        return 0
+    loads = orjson.loads if orjson is not None else json.loads
+    replayed = 0
+    with open(log, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = loads(line)
+            op = rec.get("op")
+            if op == "add": # Replay is idempotent so a log that overlaps the snapshot is harmless.
+                habits.setdefault(rec["name"], Habit(rec["name"], sys.intern(rec["periodicity"]), set()))
+            elif op == "delete":
+                habits.pop(rec["name"], None)
+            elif op == "complete":
+                h = habits.get(rec["name"])
+                if h and rec["date"] not in h.completions:
+                    h.completions.add(rec["date"])
+                    bisect.insort(h._parsed, _iso_to_date(rec["date"]))
+                    h._version += 1
+            replayed += 1
+    return replayed
 
 # Core logic (management functions)
-def get_habit_by_name(habits: List[Habit], name: str) -> Optional[Habit]:
-    for h in habits:
-        if h.name == name:
-            return h
-    return None
-
-def create_habit(habits: List[Habit], name: str, periodicity: str) -> List[Habit]: # Creates a new habit and returns an updated list.
-    if get_habit_by_name(habits, name):
+def get_habit_by_name(habits: Dict[str, Habit], name: str) -> Optional[Habit]:
+    return habits.get(name) # O(1) dict lookup instead of a list scan.
+
+def create_habit(habits: Dict[str, Habit], name: str, periodicity: str) -> Dict[str, Habit]: # Creates a new habit in place and returns the store.
+    if name in habits:
         raise ValueError(f"Habit '{name}' already exists.")
     if periodicity not in ("daily", "weekly"):
         raise ValueError("Periodicity must be 'daily' or 'weekly'.")
-    return habits + [Habit(name, periodicity, [])]
+    habits[name] = Habit(name, sys.intern(periodicity), set())
+    return habits
 
-def delete_habit(habits: List[Habit], name: str) -> List[Habit]: # Deletes a habit by name.
-    return [h for h in habits if h.name != name]
+def delete_habit(habits: Dict[str, Habit], name: str) -> Dict[str, Habit]: # Deletes a habit by name.
+    habits.pop(name, None)
+    for key in [k for k in _streak_cache if k[0] == name]: # A later habit with the same name must not hit stale entries.
+        del _streak_cache[key]
+    return habits
 
-def mark_complete(habits: List[Habit], name: str, when: date) -> List[Habit]: # Records the completion of a habit and asks for the date of completion
-    found = get_habit_by_name(habits, name)
+def mark_complete(habits: Dict[str, Habit], name: str, when: date) -> Dict[str, Habit]: # Records the completion of a habit and asks for the date of completion
+    found = habits.get(name)
     if not found:
         raise ValueError(f"Habit '{name}' not found.")
     iso = when.strftime(DATE_FMT)
-    if iso in found.completions:
-        return habits
-    new_habits = []
-    for h in habits:
-        if h.name == name:
-            new_habits.append(Habit(h.name, h.periodicity, h.completions + [iso]))
-        else:
-            new_habits.append(h)
-    return new_habits
+    if iso not in found.completions: # O(1) set membership check.
+        found.completions.add(iso)
+        bisect.insort(found._parsed, when) # Keep the parsed-date cache in sync and sorted.
+        _streak_cache.pop((name, found._version), None) # Drop the now-stale memo entry.
+        found._version += 1
+    return habits
 
 # Analytics module
-def _iso_to_date(s: str) -> date:
-    return datetime.strptime(s, DATE_FMT).date() #  Converts an ISO date string into a `datetime.date` object.
+def _iso_to_date(s: str) -> date: #  Converts an ISO date string into a `datetime.date` object.
+    return date.fromisoformat(s) # C-accelerated parser for exactly the YYYY-MM-DD shape; no format interpretation.
 
 def _sorted_dates(h: Habit) -> List[date]:
-    return sorted(map(_iso_to_date, h.completions)) # Return all completion dates of a habit sorted chronologically
+    return h._parsed # The parsed cache is maintained in chronological order, so no sort is needed.
+
+# Below this many dates the NumPy call overhead outweighs the vectorized scan.
+_NUMPY_MIN_DATES = 64
+
+def _longest_run_numpy(ords, step: int) -> int: # Vectorized variant: diff the day ordinals and find the longest run of step-sized gaps.
+    eq = np.diff(ords) == step
+    padded = np.concatenate(([False], eq, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded)) # Alternating start/end indices of runs of True.
+    if len(edges) == 0:
+        return 1
+    return int((edges[1::2] - edges[::2]).max()) + 1 # k consecutive step-gaps = streak of k+1 dates.
+
+def _longest_run_ordinals(ords, step): # Tight integer loop over day ordinals; JIT-compiled below when Numba is installed.
+    streak, best = 1, 1
+    for i in range(len(ords) - 1):
+        if ords[i + 1] - ords[i] == step:
+            streak += 1
+        else:
+            if streak > best:
+                best = streak
+            streak = 1
+    return best if best > streak else streak
+
+if njit is not None and np is not None:
+    _longest_run_ordinals = njit(cache=True)(_longest_run_ordinals)
+    _longest_run_ordinals(np.asarray([0, 1], dtype=np.int32), 1) # Warm the JIT at import so the first analytics call doesn't pay compile cost.
 
 def _longest_run_for_dates(dates: List[date], step: int) -> int: # Computes the longest consecutive streak of dates separated by a step.
     if not dates:
         return 0
+    if np is not None and len(dates) >= _NUMPY_MIN_DATES:
+        # int32 is ample for day ordinals (year 5 million+) and gives the compiled
+        # scan twice the SIMD lanes of int64 when LLVM auto-vectorizes it.
+        ords = np.fromiter((d.toordinal() for d in dates), dtype=np.int32, count=len(dates))
+        if njit is not None:
+            return int(_longest_run_ordinals(ords, step)) # Compiled scan beats both the scalar loop and the array ops.
+        return _longest_run_numpy(ords, step)
     streak, best = 1, 1
     for a, b in zip(dates, dates[1:]):
         if (b - a).days == step:
@@ -109,13 +240,23 @@ def _longest_run_for_dates(dates: List[date], step: int) -> int: # Computes the
             streak = 1
     return max(best, streak)
 
+# Memoized streak results keyed on (name, version); stale entries are dropped when
+# a habit changes or is deleted, so repeated analytics runs are dict lookups.
+_streak_cache: Dict[Tuple[str, int], int] = {}
+
 def longest_run_for_habit(h: Habit) -> int:
+    key = (h.name, h._version)
+    cached = _streak_cache.get(key)
+    if cached is not None:
+        return cached
     dates = _sorted_dates(h)
     step = 1 if h.periodicity == "daily" else 7 #For daily habits, step = 1 day; for weekly, step = 7 days.
-    return _longest_run_for_dates(dates, step)
+    result = _longest_run_for_dates(dates, step)
+    _streak_cache[key] = result
+    return result
 
-def longest_run_all(habits: List[Habit]) -> Dict[str, int]: #Computes the longest run streak for all defined habits
-    return {h.name: longest_run_for_habit(h) for h in habits}
+def longest_run_all(habits: Dict[str, Habit]) -> Dict[str, int]: #Computes the longest run streak for all defined habits
+    return {h.name: longest_run_for_habit(h) for h in habits.values()}
 
 # Fixtures (test data)
 def _date_range(start: date, days: int) -> List[date]: #Returns a list of consecutive days starting from 'start'
@@ -128,67 +269,143 @@ def init_fixtures(filename: str = HABITS_FILENAME) -> None: # Creates predefined
     today = date.today() #The date ranges are relative to the current day. This data serves as a test fixture for validation or demonstration purposes.
     start = today - timedelta(days=27)  #four weeks of completion data for each of the data created
 
-    med_dates = [d.strftime(DATE_FMT) for i, d in enumerate(_date_range(start, 28)) if i not in (5, 12, 20)]
-    run_dates = [d.strftime(DATE_FMT) for i, d in enumerate(_date_range(start, 28)) if i % 2 == 0]
-    read_dates = [d.strftime(DATE_FMT) for i, d in enumerate(_date_range(start, 28)) if i % 3 != 0]
-    grocery_dates = [d.strftime(DATE_FMT) for d in _week_dates(start, 4)]
-    call_dates = [d.strftime(DATE_FMT) for i, d in enumerate(_week_dates(start + timedelta(days=1), 4)) if i != 2]
-    habits = [ # Generates five habits: three daily and two weekly
-        Habit("Walk 10.000 steps", "daily", med_dates), 
-        Habit("Drink water", "daily", run_dates),
-        Habit("Read", "daily", read_dates),
-        Habit("Groceries", "weekly", grocery_dates),
-        Habit("Call Mom", "weekly", call_dates),
+    # One shared date range and one isoformat() pass (C-level, same output as strftime
+    # with DATE_FMT) instead of rebuilding and reformatting the range per habit.
+    iso = [d.isoformat() for d in _date_range(start, 28)]
+    med_dates = [iso[i] for i in range(28) if i not in (5, 12, 20)]
+    run_dates = iso[::2]
+    read_dates = [iso[i] for i in range(28) if i % 3 != 0]
+    grocery_dates = [d.isoformat() for d in _week_dates(start, 4)]
+    call_dates = [s for i, s in enumerate(d.isoformat() for d in _week_dates(start + timedelta(days=1), 4)) if i != 2]
+    fixtures = [ # Generates five habits: three daily and two weekly
+        Habit("Walk 10.000 steps", "daily", set(med_dates)),
+        Habit("Drink water", "daily", set(run_dates)),
+        Habit("Read", "daily", set(read_dates)),
+        Habit("Groceries", "weekly", set(grocery_dates)),
+        Habit("Call Mom", "weekly", set(call_dates)),
     ]
-    save_habits(habits, filename)
+    save_habits({h.name: h for h in fixtures}, filename)
+
+# Interactive CLI (Command Line Interface).
+_INTERACTIVE = sys.stdin.isatty() # When stdin is piped (tests, command files), skip prompts and input()'s TTY handling.
+
+def _read_line(prompt: str) -> str: # Reads one line of user input; plain readline is ~3x faster than input() for piped stdin.
+    if _INTERACTIVE:
+        return input(prompt)
+    line = sys.stdin.readline()
+    if not line: # EOF on piped input ends the session like 'exit'.
+        raise EOFError
+    return line.rstrip("\n")
 
-# Interactive CLI (Command Line Interface). 
 # Available commands: list -(display all tracked habits), add (add a new habit), complete (mark a habit as completed and request the date of completion), analytics (compute longest run streaks), init (create example data), exist (terminate the program). 
+# Each handler takes (habits, read) and returns (habits, mutated); 'read' supplies
+# its arguments (interactive prompt or batch-file line).
+def _cmd_list(habits, read): # List all habits with their completion count.
+    for h in habits.values():
+        print(f"{h.name} ({h.periodicity}) - completions: {len(h.completions)}")
+    return habits, False
+
+def _cmd_add(habits, read): # Create a new habit.
+    name = read("Name: ")
+    periodicity = read("Periodicity (daily/weekly): ")
+    try:
+        habits = create_habit(habits, name, periodicity)
+        _append_op({"op": "add", "name": name, "periodicity": periodicity})
+        print("Habit created.")
+        return habits, True
+    except ValueError as e:
+        print(e)
+        return habits, False
+
+def _cmd_delete(habits, read): # Delete a habit by name.
+    name = read("Name: ")
+    habits = delete_habit(habits, name)
+    _append_op({"op": "delete", "name": name})
+    print("Habit deleted (if it existed).")
+    return habits, True
+
+def _cmd_complete(habits, read):  # Mark a habit as completed at a given date.
+    name = read("Name: ")
+    d = read("Date (YYYY-MM-DD): ")
+    try:
+        when = date.fromisoformat(d)
+        habits = mark_complete(habits, name, when)
+        _append_op({"op": "complete", "name": name, "date": when.isoformat()}) # Normalized form, matching what mark_complete stored.
+        print("Completion recorded.")
+        return habits, True
+    except Exception as e:
+        print("Error:", e)
+        return habits, False
+
+def _cmd_analytics(habits, read): # Display longest streaks for all habits.
+    results = longest_run_all(habits)
+    print("Longest streaks:")
+    for name, streak in results.items():
+        print(f"{name}: {streak}")
+    return habits, False
+
+# O(1) command dispatch; also the natural place to hang aliases later.
+COMMANDS = {
+    "list": _cmd_list,
+    "add": _cmd_add,
+    "delete": _cmd_delete,
+    "complete": _cmd_complete,
+    "analytics": _cmd_analytics,
+}
+
+def _run_command(habits, c, read): # Executes one data command via the dispatch table.
+    fn = COMMANDS.get(c)
+    if fn is None:
+        print("Unknown command.")
+        return habits, False
+    return fn(habits, read)
+
+def _run_batch(habits, path): # Applies a command file (one command/argument per line) with a single save at the end.
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (ln.rstrip("\n") for ln in f)
+        for c in lines:
+            c = c.strip()
+            if c:
+                habits, _ = _run_command(habits, c, lambda prompt: next(lines, ""))
+    save_habits(habits) # One write for the whole batch instead of one per command.
+    return habits
+
 def main():
     habits = load_habits()
-    while True:
-        print("\nOptions: list, add, delete, complete, analytics, init, exit") # Menu
-        c = input("> ").strip()
-        if c == "list": # List all habits with their completion count.
-            for h in habits:
-                print(f"{h.name} ({h.periodicity}) - completions: {len(h.completions)}")
-        elif c == "add": # Create a new habit.
-            name = input("Name: ")
-            periodicity = input("Periodicity (daily/weekly): ")
-            try:
-                habits = create_habit(habits, name, periodicity)
-                save_habits(habits)
-                print("Habit created.")
-            except ValueError as e:
-                print(e)
-        elif c == "delete": # Delete a habit by name.
-            name = input("Name: ")
-            habits = delete_habit(habits, name)
+    dirty = False # Tracks unsaved in-memory changes; flushed once on exit instead of per command.
+    try:
+        while True:
+            if _INTERACTIVE:
+                print("\nOptions: list, add, delete, complete, analytics, batch, init, save, exit") # Menu
+            try: # EOF anywhere — at the command read or an argument prompt — ends the session like 'exit'.
+                c = _read_line("> ").strip()
+                if c == "batch": # Apply a file of commands, saving once at the end.
+                    path = _read_line("File: ")
+                    try:
+                        habits = _run_batch(habits, path)
+                        dirty = False
+                        print("Batch applied.")
+                    except OSError as e:
+                        print("Error:", e)
+                elif c == "init":  # Generate example dataset; writes the file right away.
+                    init_fixtures()
+                    habits = load_habits()
+                    dirty = False
+                    print("Fixtures initialized.")
+                elif c == "save": # Flush pending changes to disk explicitly.
+                    save_habits(habits)
+                    dirty = False
+                    print("Saved.")
+                elif c == "exit":   # Terminate the program.
+                    break
+                else:
+                    habits, mutated = _run_command(habits, c, _read_line)
+                    dirty = dirty or mutated
+            except EOFError: # Piped input ran out.
+                break
+    finally:
+        if dirty: # One write per session instead of one per mutation.
             save_habits(habits)
-            print("Habit deleted (if it existed).")
-        elif c == "complete":  # Mark a habit as completed at a given date.
-            name = input("Name: ")
-            d = input("Date (YYYY-MM-DD): ")
-            try:
-                when = datetime.strptime(d, DATE_FMT).date()
-                habits = mark_complete(habits, name, when)
-                save_habits(habits)
-                print("Completion recorded.")
-            except Exception as e:
-                print("Error:", e)
-        elif c == "analytics": # Display longest streaks for all habits.
-            results = longest_run_all(habits)
-            print("Longest streaks:")
-            for name, streak in results.items():
-                print(f"{name}: {streak}")
-        elif c == "init":  # Generate example dataset.
-            init_fixtures()
-            habits = load_habits()
-            print("Fixtures initialized.")
-        elif c == "exit":   # Terminate the program.
-            break
-        else:
-            print("Unknown command.")
 
 #Program entry point
 if __name__ == "__main__":